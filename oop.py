@@ -1,5 +1,8 @@
+import argparse
 import csv
 import os
+import queue
+import threading
 import requests
 from collections import defaultdict
 
@@ -7,7 +10,7 @@ from bs4 import BeautifulSoup
 import time
 import re
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import warnings
 import urllib.parse
 import logging
@@ -42,8 +45,22 @@ VALID_FORMS = {'10-K', '10-Q', '8-K', 'S-1', 'S-1/A'}
 # VALID_FORMS = {'10-K'}
 KEYWORDS = ['license', 'licensing', 'license agreement', 'lease', 'royalty', 'royalties', 'milestone payment',
             'supply agreement', 'patent transfer', 'trademark transfer', 'technology transfer']
+# Relevance scoring of exhibit descriptions, applied before anything is downloaded
+RELEVANCE_THRESHOLD = 1.0
+TERM_WEIGHTS = {'license agreement': 3.0, 'licensing': 2.0, 'license': 1.0, 'sublicense': 2.0, 'royalty': 2.0,
+                'royalties': 2.0, 'milestone payment': 2.0, 'supply agreement': 1.5, 'patent transfer': 2.0,
+                'trademark transfer': 2.0, 'technology transfer': 2.0, 'lease': 1.0, 'agreement': 0.5}
+NEGATIVE_PHRASES = {'press release': -3.0, 'license application': -3.0, 'biologics license application': -2.0,
+                    'business license': -2.0, 'licensed public accounting firm': -4.0, 'consent of': -2.0,
+                    'certification': -2.0}
+# Priors keyed by the exhibit number's major part (10.x material contracts over 99.x press releases)
+EXHIBIT_PRIORS = {'10': 1.0, '2': 0.5, '99': -1.0, '23': -2.0, '31': -2.0, '32': -2.0}
 # Directory
 COMPANIES_DIR = './test_folder'
+# Daemon mode: EDGAR daily form index feed, polling interval in seconds and bound on queued filings
+DAILY_INDEX_URL = 'https://www.sec.gov/Archives/edgar/daily-index'
+POLL_INTERVAL = 300
+QUEUE_MAXSIZE = 50
 
 
 class BaseFormHandler:
@@ -96,7 +113,7 @@ class BaseFormHandler:
         self.process_exhibits(doc_soup, accession_folder, soup)
 
     @staticmethod
-    def download_file(url, accession_folder, save_path, description):
+    def download_file(url, accession_folder, save_path, description, score):
         """
             Downloads a file from a URL, saves it to the specified path, and logs the download details.
 
@@ -105,6 +122,7 @@ class BaseFormHandler:
                 accession_folder (str): Directory to save the file.
                 save_path (str): Path to save the downloaded file.
                 description (str): Description of the file being downloaded.
+                score (float): Relevance score of the exhibit description.
         """
         # Parse metadata
         parts = save_path.split(os.sep)
@@ -128,7 +146,7 @@ class BaseFormHandler:
                 with open('exhibits_log.csv', mode='a', newline='', encoding='utf-8') as file:
                     writer = csv.writer(file)
                     writer.writerow(
-                        [name, year, doc_type, acc_number, exhibit_num, description])
+                        [name, year, doc_type, acc_number, exhibit_num, description, f"{score:.2f}"])
             else:
                 logger.warning(f"Failed to download {url}")
         except Exception as e:
@@ -196,6 +214,34 @@ class BaseFormHandler:
                 return True
         return False
 
+    @staticmethod
+    def score_exhibits(exhibits: list[tuple[str, str]]) -> list[float]:
+        """
+            Scores a batch of exhibit descriptions for how likely they are to be licensing agreements.
+
+            Each description is turned into a term-presence vector over TERM_WEIGHTS and NEGATIVE_PHRASES,
+            which is dotted with the weight vector and offset by the exhibit number prior in EXHIBIT_PRIORS.
+
+            Args:
+                exhibits (list[tuple[str, str]]): Pairs of cleaned exhibit number and normalized description.
+
+            Returns:
+                list[float]: Relevance score for each exhibit, in the same order.
+        """
+        terms = {**TERM_WEIGHTS, **NEGATIVE_PHRASES}
+        patterns = [re.compile(rf'\b{re.escape(term)}\b') for term in terms]
+        weights = list(terms.values())
+
+        scores = []
+        for exhibit_number, description in exhibits:
+            vector = [1 if pattern.search(description) else 0 for pattern in patterns]
+            score = sum(w * x for w, x in zip(weights, vector))
+            major = re.search(r'\d+', exhibit_number)
+            if major:
+                score += EXHIBIT_PRIORS.get(major.group().lstrip('0'), 0.0)
+            scores.append(score)
+        return scores
+
     @staticmethod
     def fetch_page(url: str):
         """
@@ -301,7 +347,7 @@ class BaseFormHandler:
 
            Args:
                soup (BeautifulSoup): Parsed HTML content of the document page.
-               exhibits (list[tuple]): List of exhibits to check and download.
+               exhibits (list[tuple]): List of exhibits, descriptions and relevance scores to check and download.
                accession_folder (str): Directory to save downloaded exhibits.
        """
         # Locate all tables
@@ -310,7 +356,7 @@ class BaseFormHandler:
         copy = exhibits.copy()
 
         # Loop through rows and remove from set of leftover exhibits if found
-        for exhibit, description in copy:
+        for exhibit, description, score in copy:
             for row in rows:
                 tds = row.find_all('td')
                 if len(tds) >= 4 and 'EX-' in tds[3].text:
@@ -322,15 +368,15 @@ class BaseFormHandler:
                             path = os.path.join(accession_folder, f"{tds[3].text[3:]}.html")
                             # print(f"Downloading file for {tds[3].text} from {document_link}")
                             # logger.info(f"Downloading exhibit {exhibit} to {path} from {document_link}")
-                            self.download_file(document_link, accession_folder, path, description.text)
-                            exhibits.remove((exhibit, description))
+                            self.download_file(document_link, accession_folder, path, description.text, score)
+                            exhibits.remove((exhibit, description, score))
                             break
                         else:
                             logger.warning(f"Link tag not found for {tds[3].text}")
 
         # For all exhibits without a link, log it to file
         if exhibits:
-            for exhibit, description in exhibits:
+            for exhibit, description, score in exhibits:
                 os.makedirs(accession_folder, exist_ok=True)
                 with open(os.path.join(accession_folder, "extras.txt"), "a", encoding='utf-8') as f:
                     logger.info(exhibit)
@@ -379,9 +425,10 @@ class BaseFormHandler:
                 last_section: Last HTML section element to parse tables from.
 
             Returns:
-                exhibits: List of leftover exhibits and descriptions for further processing.
+                exhibits: List of leftover exhibits, descriptions and scores for further processing.
         """
         exhibits = []
+        candidates = []
         viewed = set()
         # Traverse tables after the last section to find exhibits
         for sibling in last_section.find_all_next():
@@ -404,20 +451,33 @@ class BaseFormHandler:
                                 continue
                             # logger.info(f"Found exhibit: {exhibit_number}")
 
-                            # Locate and download link if present, or append to exhibits for later
+                            # Locate link if present, downloading is deferred until the batch is scored
                             link_tag = cells[0].find('a', href=True)
                             if not link_tag:
                                 link_tag = cells[contain.index(True) + 1].find('a', href=True)
-                            if link_tag and 'sec.gov' in link_tag['href']:
-                                filing_url = link_tag['href']
-                                save_path = os.path.join(accession_folder, f"{exhibit_number}.html")
-                                self.download_file(filing_url, accession_folder, save_path,
-                                                   cells[1:][contain.index(True)].get_text(strip=True))
-                            else:
-                                c = cells[1:]
-                                if c[contain.index(True)].get_text(strip=True) not in viewed:
-                                    exhibits.append((exhibit_number, c[contain.index(True)]))
-                                    viewed.add(c[contain.index(True)].get_text(strip=True))
+                            candidates.append((exhibit_number, cells[1:][contain.index(True)], link_tag))
+
+        # Score every candidate in the filing at once and drop the likely false positives
+        scores = self.score_exhibits(
+            [(exhibit_number, self.normalize_text(description.get_text(strip=True)))
+             for exhibit_number, description, _ in candidates])
+
+        for (exhibit_number, description, link_tag), score in zip(candidates, scores):
+            if score < RELEVANCE_THRESHOLD:
+                logger.info(f"Skipping exhibit {exhibit_number} (score {score:.2f}): "
+                            f"{description.get_text(strip=True)}")
+                continue
+
+            # Download link if present, or append to exhibits for later
+            if link_tag and 'sec.gov' in link_tag['href']:
+                filing_url = link_tag['href']
+                save_path = os.path.join(accession_folder, f"{exhibit_number}.html")
+                self.download_file(filing_url, accession_folder, save_path,
+                                   description.get_text(strip=True), score)
+            else:
+                if description.get_text(strip=True) not in viewed:
+                    exhibits.append((exhibit_number, description, score))
+                    viewed.add(description.get_text(strip=True))
 
         return exhibits
 
@@ -674,5 +734,158 @@ def main():
     end = time.time()
     logger.info(f"Finished at {end}")
     logger.info(f"Time taken is {end - start}")
+
+
+def load_watchlist() -> dict[str, str | None]:
+    """
+        Builds the CIK watchlist from the company JSON files in COMPANIES_DIR.
+
+        Returns:
+            dict[str, str | None]: CIK without leading zeros mapped to company name, or None if only
+            submission files exist for that CIK.
+    """
+    watchlist = {}
+    for file in os.listdir(COMPANIES_DIR):
+        match = re.match(r'CIK(\d+)(-submissions.*)?\.json', file)
+        if not match:
+            continue
+        cik = match.group(1).lstrip('0')
+        watchlist.setdefault(cik, None)
+        if match.group(2):
+            continue
+        try:
+            with open(os.path.join(COMPANIES_DIR, file), 'r') as f:
+                watchlist[cik] = json.load(f).get('name')
+        except Exception as e:
+            logger.error(f"Failed to read company file {file}: {e}")
+    return watchlist
+
+
+def parse_form_index(text: str) -> list[tuple]:
+    """
+        Parses an EDGAR daily form index (form.YYYYMMDD.idx) into filing entries.
+
+        Args:
+            text (str): Contents of the index file.
+
+        Returns:
+            list[tuple]: Entries of (form_type, company_name, cik, date, acc_number), date in '%Y-%m-%d' format.
+    """
+    entries = []
+    lines = text.splitlines()
+    # Entries start after the dashed line below the column headers
+    start = next((i + 1 for i, line in enumerate(lines) if line.startswith('---')), len(lines))
+    for line in lines[start:]:
+        match = re.match(r'(.+?)\s{2,}(.+?)\s{2,}(\d+)\s+(\d{4}-?\d{2}-?\d{2})\s+(\S+)$', line.strip())
+        if not match:
+            continue
+        form_type, company_name, cik, date, file_name = match.groups()
+        date = date.replace('-', '')
+        date = f"{date[:4]}-{date[4:6]}-{date[6:]}"
+        acc_number = os.path.splitext(os.path.basename(file_name))[0]
+        entries.append((form_type.strip(), company_name.strip(), cik.lstrip('0'), date, acc_number))
+    return entries
+
+
+def fetch_form_index(day) -> list[tuple]:
+    """
+        Fetches and parses the EDGAR daily form index for a given day.
+
+        Args:
+            day (date): Day of the index to fetch.
+
+        Returns:
+            list[tuple]: Parsed index entries, empty if the index is not yet published or fetching fails.
+    """
+    quarter = (day.month - 1) // 3 + 1
+    url = f"{DAILY_INDEX_URL}/{day.year}/QTR{quarter}/form.{day.strftime('%Y%m%d')}.idx"
+    try:
+        response = session.get(url)
+        if response.status_code == 200:
+            return parse_form_index(response.text)
+        elif response.status_code in (403, 404):
+            logger.info(f"Daily index not available at {url} (Status code: {response.status_code})")
+        else:
+            logger.warning(f"Failed to fetch daily index {url} (Status code: {response.status_code})")
+    except Exception as e:
+        logger.error(f"Exception occurred while fetching daily index {url}: {e}")
+    return []
+
+
+def process_queue(filings: queue.Queue):
+    """
+        Worker loop feeding queued filings through their form handlers until a None sentinel is received.
+
+        Args:
+            filings (queue.Queue): Queue of (name, cik, acc_number, date, form_type) filings.
+    """
+    while True:
+        filing = filings.get()
+        if filing is None:
+            filings.task_done()
+            break
+        name, cik, acc_num, date, form_type = filing
+        try:
+            handler_class = FormHandlerFactory.get_form_handler(form_type)
+            if handler_class:
+                handler_class.process_filing(name, cik, acc_num, date, form_type)
+            else:
+                logger.info(f"No handler for form type {form_type}")
+        except Exception as e:
+            logger.error(f"Error processing filing {acc_num}: {e}")
+        finally:
+            filings.task_done()
+
+
+def run_daemon(poll_interval: int = POLL_INTERVAL):
+    """
+        Continuously polls the EDGAR daily form index and processes new filings from watched companies.
+
+        Filings are handed to a single worker through a bounded queue, so polling blocks while the worker
+        is behind instead of piling up requests.
+
+        Args:
+            poll_interval (int): Seconds to wait between polls.
+    """
+    watchlist = load_watchlist()
+    logger.info(f"Daemon started watching {len(watchlist)} companies")
+    filings = queue.Queue(maxsize=QUEUE_MAXSIZE)
+    worker = threading.Thread(target=process_queue, args=(filings,), daemon=True)
+    worker.start()
+
+    # Accessions already queued, keyed by index day so old days can be dropped
+    seen = defaultdict(set)
+    try:
+        while True:
+            today = datetime.now().date()
+            # Yesterday's index is polled as well since it may only be published after midnight
+            days = (today - timedelta(days=1), today)
+            for day in list(seen):
+                if day not in days:
+                    del seen[day]
+
+            for day in days:
+                for form_type, company_name, cik, date, acc_num in fetch_form_index(day):
+                    if cik not in watchlist or form_type not in VALID_FORMS or acc_num in seen[day]:
+                        continue
+                    seen[day].add(acc_num)
+                    logger.info(f"Queueing {form_type} filing {acc_num} for {company_name}")
+                    # Blocks while the queue is full
+                    filings.put((watchlist[cik] or company_name, cik, acc_num, date, form_type))
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        logger.info("Daemon interrupted, finishing queued filings")
+    finally:
+        filings.put(None)
+        worker.join()
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Scrape licensing exhibits from SEC EDGAR filings')
+    parser.add_argument('--daemon', action='store_true', help='continuously poll the EDGAR daily index')
+    parser.add_argument('--poll-interval', type=int, default=POLL_INTERVAL, help='seconds between polls')
+    args = parser.parse_args()
+    if args.daemon:
+        run_daemon(args.poll_interval)
+    else:
+        main()
\ No newline at end of file